@@ -24,30 +24,171 @@ Version: 2.2.0 (MO2 Plugin with Bundled Libs Support)
 """
 
 from __future__ import annotations
+import asyncio
+import copy
+import functools
+import io
+import importlib.util
 import os
 import json
 import time
 import re
 import logging
-import configparser
 import heapq
 import textwrap
 import webbrowser
 import subprocess
 import sys
 import site
-from collections import defaultdict, deque
-from datetime import datetime, timedelta
+import sqlite3
+import struct
+from collections import defaultdict
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
 from typing import List, Dict, Set, Any, Optional, Tuple
 
+# orjson 为可选依赖 (可放入 lib 目录)，缺失时回退到标准库 json
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 
 site.addsitedir(os.path.join(os.path.dirname(__file__), "lib"))
-import bs4
-import playwright.sync_api
-BS4_MODULE = bs4
-PLAYWRIGHT_MODULE = playwright
-DEPENDENCIES_MET = True
+# bs4 与 playwright 体积较大，插件加载时只检查它们是否存在，真正的导入推迟到首次分析时
+DEPENDENCIES_MET = all(importlib.util.find_spec(name) is not None for name in ("bs4", "soupsieve", "playwright"))
+BS4_MODULE = None
+PLAYWRIGHT_MODULE = None
+BS4_PARSER = 'html.parser'
+LEXBOR_PARSER = None
+
+# 预编译的选择器与正则，在每个页面的解析中复用 (选择器在导入 soupsieve 后编译)
+_SEL_TITLE = _SEL_BREADCRUMB = _SEL_TABLE_ROWS = None
+_URL_RE = re.compile(r'/mods/(\d+)')
+_RULE_DELIMITER_RE = re.compile('[=:]')
+# Cookie字符串中以 ';' 分隔的各部分，双引号内的 ';' 不作为分隔符
+_COOKIE_PART_RE = re.compile(r'(?:[^;"]|"(?:[^"\\]|\\.)*")+')
+_COOKIE_ESCAPE_RE = re.compile(r'\\(.)')
+_WHITESPACE_RE = re.compile(r'\s+')
+_UINT32_BE = struct.Struct('>I')
+# 模组页面中依赖表格的标题 (小写) 与其在缓存条目中对应的键
+_DEP_SECTIONS = (('nexus requirements', 'requires'), ('mods requiring this file', 'required_by'))
+
+# 浏览器回退抓取时屏蔽的内容: 解析只需要页面HTML，图片与广告统计脚本只会拖慢页面加载。
+# 通过 Chromium 启动参数屏蔽而不使用 context.route，因为启用请求路由会禁用浏览器的HTTP缓存
+_BLOCKED_HOSTS = ('*google-analytics.com', '*googletagmanager.com', '*doubleclick.net', '*googlesyndication.com',
+                  'adservice.google.*')
+_BROWSER_ARGS = ['--blink-settings=imagesEnabled=false',
+                 '--host-resolver-rules=' + ', '.join(f'MAP {host} ~NOTFOUND' for host in _BLOCKED_HOSTS)]
+
+# 报告的静态样式表，直接写入报告文件，无需在生成时再整理缩进
+_TREE_REPORT_CSS = 'body{font-family: -apple-system, BlinkMacSystemFont, "Segoe UI", sans-serif; padding:20px; line-height: 1.6;} h1{text-align:center;border-bottom:2px solid #3498db;padding-bottom:10px} ul{list-style-type:none;padding-left:25px;border-left:1px dashed #ccc} li{margin:10px 0} a{text-decoration:none;color:#2980b9} a:hover{text-decoration:underline} .icon{display:inline-block;width:24px;text-align:center;margin-right:8px;font-size:1.2em} .notes{font-style:italic;color:#7f8c8d;font-size:0.9em} .replacement-info, .replacement-info a{font-style:italic;color:#3498db;font-size:0.9em; font-weight: bold;} .satisfied{color:#27ae60} .missing{color:#c0392b} .ignored{color:#7f8c8d} .cycle{color:#f39c12}'
+_SORT_REPORT_CSS = 'body{font-family:-apple-system, BlinkMacSystemFont, "Segoe UI", sans-serif;margin:20px;background-color:#f8f9fa; line-height: 1.6;} h1,h2{color:#343a40;border-bottom:2px solid #007bff;padding-bottom:10px} table{width:100%;border-collapse:collapse;margin-top:20px;box-shadow:0 2px 5px rgba(0,0,0,0.1)} th,td{padding:12px 15px;text-align:left;border-bottom:1px solid #dee2e6; vertical-align: top;} th{background-color:#007bff;color:white} tr:nth-child(even){background-color:#f2f2f2} tr:hover{background-color:#e9ecef} a{color:#0056b3;text-decoration:none} a:hover{text-decoration:underline} .nexus-name,.details{font-size:0.9em;color:#6c757d} .details{margin-top: 5px; padding-left: 10px; border-left: 2px solid #ddd;} .notes{font-style:italic;color:#5a6268;font-size:0.9em; margin-left: 4px;} .no-deps{color:#28a745;font-style:italic} .dep-satisfied, .dep-satisfied strong{color: #1e6b20;} .dep-original{color: #555; text-decoration: line-through;} .dep-missing, .dep-missing a, .dep-missing strong{color:#c0392b !important; font-weight: bold;} .replacement-info, .replacement-info a{font-style:italic;color:#3498db;font-size:0.9em; font-weight: bold;} .error-box,.warning-box{padding:1rem 1.5rem;margin: 20px 0;border-radius:5px} .error-box{background-color:#f8d7da;color:#721c24;border:1px solid #f5c6cb} .warning-box{background-color:#fff3cd;color:#856404;border:1px solid #ffeeba} .warning-box h2,.error-box h2{border:none;margin-top:0} .warning-box li{margin:10px 0} .category-header td{background-color:#e9ecef;font-weight:bold;color:#495057; text-align: center;}'
+# 模组名称、文件夹名与备注写入报告前的HTML转义表，一次 translate 完成全部替换
+_ESCAPE_TABLE = str.maketrans({'&': '&amp;', '<': '&lt;', '>': '&gt;', '"': '&quot;', "'": '&#x27;'})
+# 报告中固定不变的文件头 (含样式表)，导入时编码一次，生成报告时直接写入
+_TREE_REPORT_HEAD = f"<!DOCTYPE html><html lang=\"zh-CN\"><head><meta charset=\"UTF-8\"><title>模组缺失依赖树报告</title><style>\n{_TREE_REPORT_CSS}\n</style></head><body>\n".encode('utf-8')
+_SORT_REPORT_HEAD = f"<!DOCTYPE html><html lang='zh-CN'><head><meta charset='UTF-8'><title>MO2模组智能排序报告</title><style>\n{_SORT_REPORT_CSS}\n</style></head><body>".encode('utf-8')
+
+# 每新抓取多少个模组就把缓存写回磁盘一次，避免长时间分析中途崩溃丢失全部结果
+CACHE_FLUSH_INTERVAL = 50
+# 直接HTTP请求连续这么多次未能解析出模组页面 (通常是被验证页面拦截) 后，本次运行余下的抓取直接使用浏览器导航
+REQUEST_FALLBACK_LIMIT = 5
+# 抓取过程中缓冲的日志至少每隔这么多秒发送一次，保证长批次中进度仍能实时显示
+LOG_FLUSH_INTERVAL = 0.25
+# 单条 SQL 中绑定参数的数量上限 (旧版 SQLite 限制为 999)
+_SQLITE_MAX_PARAMS = 500
+
+
+def _dump_json_bytes(data: Any) -> bytes:
+    """将数据序列化为紧凑的UTF-8 JSON字节串。"""
+    if orjson is not None:
+        return orjson.dumps(data)
+    return json.dumps(data, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+def _load_json_bytes(data: bytes) -> Any:
+    """直接从UTF-8字节串反序列化JSON，不经过文本I/O层。"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+@functools.lru_cache(maxsize=4)
+def _read_rules_file(path: str, mtime_ns: int) -> Tuple[frozenset, Dict[str, str]]:
+    """
+    解析规则文件，返回 ([Ignore] 中的ID集合, [Replace] 映射)。
+    mtime_ns 只作为缓存键使用：文件未修改时重复分析直接复用解析结果，修改后自动重新解析。
+    规则文件只有两个由 "ID" 或 "ID = ID" (与 configparser 一样也接受 "ID: ID") 行组成的区域，逐行解析即可，无需 configparser。
+    """
+    ignore_ids: Set[str] = set()
+    replacement_map: Dict[str, str] = {}
+    section = None
+    # 记事本等编辑器可能写入 BOM，utf-8-sig 会将其去掉，避免首行的区域名无法识别
+    for raw_line in Path(path).read_text(encoding='utf-8-sig').splitlines():
+        line = raw_line.strip()
+        if not line or line[0] in '#;': continue
+        if line[0] == '[':
+            # 区域名之后可能跟有注释，例如 "[Ignore] ; 说明"
+            end = line.find(']')
+            if end < 0: raise ValueError(f"区域名缺少 ']': {line}")
+            section = line[1:end].strip().lower()
+            continue
+        # 与 configparser 相同，以第一个出现的 '=' 或 ':' 作为分隔符
+        if match := _RULE_DELIMITER_RE.search(line):
+            key, value = line[:match.start()].strip(), line[match.end():].strip()
+        else:
+            key, value = line, None
+        if section == 'ignore':
+            ignore_ids.add(key)
+        elif section == 'replace' and value is not None:
+            replacement_map[key] = value
+    return frozenset(ignore_ids), replacement_map
+
+
+def _write_default_rules_file(settings: PluginSettings):
+    """写入规则文件模板。只依赖设置中的路径，可在界面线程中直接调用；写入失败时抛出 OSError。"""
+    template_content = textwrap.dedent(f"""
+    # 这是模组规则的配置文件。
+    # 您可以在MO2插件的数据目录中找到此文件：
+    # {settings.BASE_DIR}
+
+    [Ignore]
+    # 在此区域下的模组ID将被视为“已满足”，不会被报告为缺失。
+    # 示例：
+    # 12345
+
+    [Replace]
+    # 在此区域下，您可以定义替代关系。
+    # 格式为: 被替代的模组ID = 用来替代的模组ID
+    # 示例：一个旧的兼容补丁被一个整合版MOD取代
+    # 44444 = 55555
+    """)
+    settings.RULES_PATH.write_text(template_content.strip(), encoding='utf-8')
+
+
+@functools.lru_cache(maxsize=None)
+def _import_heavy_dependencies():
+    """导入 bs4 / playwright 并编译页面选择器，整个进程中只执行一次。"""
+    global BS4_MODULE, PLAYWRIGHT_MODULE, BS4_PARSER, LEXBOR_PARSER, _SEL_TITLE, _SEL_BREADCRUMB, _SEL_TABLE_ROWS
+    import bs4
+    import soupsieve
+    import playwright.async_api
+    BS4_MODULE = bs4
+    PLAYWRIGHT_MODULE = playwright
+
+    # 若 lib 中提供了 lxml，则使用其C实现的解析器，否则回退到纯Python的 html.parser
+    if importlib.util.find_spec("lxml") is not None:
+        BS4_PARSER = 'lxml'
+    # 若 lib 中提供了 selectolax，则直接用其C实现的 Lexbor 引擎解析模组页面，完全绕过 BeautifulSoup
+    if importlib.util.find_spec("selectolax") is not None:
+        from selectolax.lexbor import LexborHTMLParser
+        LEXBOR_PARSER = LexborHTMLParser
+
+    _SEL_TITLE = soupsieve.compile('#pagetitle > h1')
+    _SEL_BREADCRUMB = soupsieve.compile('ul#breadcrumb li a')
+    _SEL_TABLE_ROWS = soupsieve.compile('tbody tr')
 
 import mobase
 from PyQt6.QtWidgets import (
@@ -55,9 +196,9 @@ from PyQt6.QtWidgets import (
     QDialogButtonBox, QMessageBox, QGroupBox, QPlainTextEdit
 )
 from PyQt6.QtCore import (
-    QObject, QThread, pyqtSignal, Qt
+    QObject, QThread, QTimer, pyqtSignal, Qt
 )
-from PyQt6.QtGui import QIcon, QTextCursor
+from PyQt6.QtGui import QIcon
 
 # --- 基础导入 ---
 # 将依赖库的导入推迟到 init 方法中，在 sys.path 被修改后进行
@@ -114,12 +255,19 @@ class PluginSettings:
 
         self.RULES_PATH = self.BASE_DIR / 'rules.ini'
         self.COOKIES_PATH = self.BASE_DIR / 'cookies.json'
+        self.CACHE_DB_PATH = self.BASE_DIR / 'nexus_cache.sqlite3'
+        # 旧版的单文件JSON缓存，仅用于首次启动时迁移到数据库
         self.CACHE_FILE_PATH = self.BASE_DIR / 'nexus_cache.json'
+        # Chromium 持久化用户目录 (保存Cookies与浏览器自身的HTTP缓存)
+        self.BROWSER_PROFILE_DIR = self.BASE_DIR / 'pw_profile'
 
         # 从 MO2 的设置系统中读取值
-        self.CACHE_EXPIRATION_DAYS: int = int(str(self._organizer.pluginSetting(self._plugin_name, "cache_expiration_days")))
-        self.REQUEST_TIMEOUT: int = int(str(self._organizer.pluginSetting(self._plugin_name, "request_timeout")))
+        self.CACHE_EXPIRATION_DAYS: int = self._int_setting("cache_expiration_days")
+        self.REQUEST_TIMEOUT: int = self._int_setting("request_timeout")
+        # 同一浏览器上下文中同时进行的页面抓取数量上限
+        self.MAX_CONCURRENT_REQUESTS: int = max(1, self._int_setting("max_concurrent_requests"))
         self.AUTO_OPEN_REPORT: bool = bool(self._organizer.pluginSetting(self._plugin_name, "auto_open_report"))
+        self.LOG_MAX_LINES: int = self._int_setting("log_max_lines")
 
         self.GAME_NAME = self._organizer.managedGame().gameNexusName()
         if not self.GAME_NAME:
@@ -138,37 +286,194 @@ class PluginSettings:
             "Presets - ENB and ReShade": 85, "Overhauls": 90, "Miscellaneous": 95, "Patches": 99, "Default": 50
         }
 
+    def _int_setting(self, key: str) -> int:
+        # MO2 已按设置的默认值类型返回 int，无需再经过 str 转换
+        return int(self._organizer.pluginSetting(self._plugin_name, key))
+
 
 # =============================================================================
 # 2. 核心分析逻辑 (ModAnalyzer)
 # =============================================================================
+@dataclass(slots=True)
+class TreeNode:
+    """依赖树中的一个模组节点。"""
+    id: str
+    name: str = "加载中..."
+    status: str = "missing"
+    replacement_info: Optional[Dict[str, str]] = None
+    notes: str = ""
+    children: List[TreeNode] = field(default_factory=list)
+
+
+class ModCacheDB:
+    """
+    基于 SQLite (WAL 模式) 的模组数据缓存，每个模组一行，按ID读取并增量写入。
+    """
+
+    def __init__(self, path: Path):
+        self.conn = sqlite3.connect(path)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA synchronous=NORMAL')
+        self.conn.execute('CREATE TABLE IF NOT EXISTS mods (id TEXT PRIMARY KEY, data BLOB NOT NULL)')
+
+    def is_empty(self) -> bool:
+        return self.conn.execute('SELECT 1 FROM mods LIMIT 1').fetchone() is None
+
+    def load_many(self, mod_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """批量读取指定ID的缓存条目，数据库中不存在的ID不会出现在结果中。"""
+        entries = {}
+        for start in range(0, len(mod_ids), _SQLITE_MAX_PARAMS):
+            chunk = mod_ids[start:start + _SQLITE_MAX_PARAMS]
+            rows = self.conn.execute(f"SELECT id, data FROM mods WHERE id IN ({','.join('?' * len(chunk))})", chunk)
+            entries.update((sys.intern(mod_id), _load_json_bytes(data)) for mod_id, data in rows)
+        return entries
+
+    def save_many(self, entries: Dict[str, Dict[str, Any]]):
+        """在同一个事务中写入 (或覆盖) 一批条目。"""
+        with self.conn:
+            self.conn.executemany('INSERT OR REPLACE INTO mods (id, data) VALUES (?, ?)',
+                                  [(mod_id, _dump_json_bytes(entry)) for mod_id, entry in entries.items()])
+
+    def clear(self):
+        with self.conn:
+            self.conn.execute('DELETE FROM mods')
+
+    def close(self):
+        self.conn.close()
+
+
+class BrowserSession:
+    """
+    Playwright 浏览器会话: 私有事件循环 + 基于磁盘用户目录的持久化浏览器上下文。
+    由后台工作线程持有，在多次分析之间保持运行，避免每次分析都冷启动 Chromium。
+    所有方法都必须在创建它的线程中调用。
+    """
+
+    USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/125.0.0.0 Safari/537.36'
+
+    def __init__(self, profile_dir: Path):
+        self.profile_dir = profile_dir
+        self.loop = asyncio.new_event_loop()
+        self.playwright: Optional[PLAYWRIGHT_MODULE.async_api.Playwright] = None
+        self.context: Optional[PLAYWRIGHT_MODULE.async_api.BrowserContext] = None
+        # 空闲页面池；并发数受信号量限制，因此最多只会创建 MAX_CONCURRENT_REQUESTS 个页面
+        self.idle_pages: List[PLAYWRIGHT_MODULE.async_api.Page] = []
+
+    @property
+    def is_alive(self) -> bool:
+        return self.context is not None
+
+    def run(self, coro):
+        return self.loop.run_until_complete(coro)
+
+    async def start(self, cookies: list):
+        # 上下文意外关闭后重新启动时，先停止遗留的 Playwright 驱动进程
+        if self.playwright:
+            try:
+                await self.playwright.stop()
+            except Exception:
+                log.exception("停止遗留的 Playwright 实例时出错。")
+            self.playwright = None
+        self.playwright = await PLAYWRIGHT_MODULE.async_api.async_playwright().start()
+        self.context = await self.playwright.chromium.launch_persistent_context(
+            user_data_dir=str(self.profile_dir), headless=True, user_agent=self.USER_AGENT, args=_BROWSER_ARGS
+        )
+        # 浏览器进程意外退出时标记会话失效，下次分析会重新启动
+        self.context.on("close", lambda _: self._on_context_closed())
+        await self.context.add_cookies(cookies)
+
+    async def park_idle_pages(self):
+        """
+        将空闲页面导航到空白页。两批抓取之间事件循环不运行，停留在模组页面上的脚本、定时器与连接
+        会一直挂在渲染进程中；页面本身保留在池中供下一批复用。
+        """
+        live_pages = [page for page in self.idle_pages if not page.is_closed()]
+        results = await asyncio.gather(*(page.goto('about:blank') for page in live_pages), return_exceptions=True)
+        # 无法回到空白页的页面直接关闭并移出池
+        parked = []
+        for page, result in zip(live_pages, results):
+            if not isinstance(result, Exception):
+                parked.append(page)
+                continue
+            try:
+                await page.close()
+            except PLAYWRIGHT_MODULE.async_api.Error:
+                pass
+        self.idle_pages[:] = parked
+
+    def _on_context_closed(self):
+        self.context = None
+        self.idle_pages.clear()
+
+    async def stop(self):
+        try:
+            if self.context:
+                await self.context.close()
+        finally:
+            if self.playwright:
+                await self.playwright.stop()
+            self.playwright = None
+            self._on_context_closed()
+
+    def close(self):
+        """关闭浏览器并释放事件循环。"""
+        if self.loop.is_closed():
+            return
+        try:
+            self.run(self.stop())
+        finally:
+            self.loop.close()
+
+
 class ModAnalyzer:
     """
     核心分析类，所有功能逻辑的实现。
     """
 
-    def __init__(self, organizer: mobase.IOrganizer, settings: PluginSettings, log_emitter: Any):
+    # 已解析的Cookies: (文件路径, 修改时间, Cookies列表)。在多次分析之间共享，文件未变化时不再重复解析
+    _cookies_cache: Optional[Tuple[str, int, list]] = None
+
+    def __init__(self, organizer: mobase.IOrganizer, settings: PluginSettings, log_emitter: Any,
+                 browser_session: Optional[BrowserSession] = None):
         self.organizer = organizer
         self.settings = settings
         self.log_emitter = log_emitter
-
-        self.cache_data = self._load_cache()
+        # 逐个模组的抓取进度先暂存，按时间间隔合并为一次信号发送，减少跨线程的界面更新
+        self._log_buffer: List[str] = []
+        self._last_log_flush = time.monotonic()
+        _import_heavy_dependencies()
+
+        # 缓存条目按需从数据库读取到 cache_data；_db_checked 记录已查询过的ID，避免对不存在的条目重复查询
+        self.cache_db = self._open_cache_db()
+        self.cache_data: Dict[str, Dict[str, Any]] = {}
+        self._db_checked: Set[str] = set()
+        self._unsaved_ids: Set[str] = set()
         self.ignore_ids: Set[str] = set()
         self.replacement_map: Dict[str, str] = {}
 
         self.folder_to_id: Dict[str, str] = {}
         self.id_to_folders: Dict[str, List[str]] = defaultdict(list)
         self.installed_ids: Set[str] = set()
-
-        self.playwright: Optional[PLAYWRIGHT_MODULE.sync_api.Playwright] = None
-        self.browser: Optional[PLAYWRIGHT_MODULE.sync_api.Browser] = None
-        self.page: Optional[PLAYWRIGHT_MODULE.sync_api.Page] = None
+        # 视为已满足的前置ID集合，在规则与已安装模组都加载后构建
+        self._satisfied_ids: Set[str] = set()
+        self._priority_by_id: Dict[str, int] = {}
+
+        # 浏览器会话可由调用方传入并跨分析复用；未传入时由分析器自行创建，并在 close() 时关闭
+        self.session = browser_session
+        self._owns_session = browser_session is None
+        # 本次运行中已确定的模组数据 (有效的缓存条目、新抓取或抓取失败的结果)，避免重复校验缓存时间戳
+        self._resolved_mods: Dict[str, Dict[str, Any]] = {}
+        # 本次运行中抓取失败的结果，不写入磁盘缓存，仅用于避免重复抓取
+        self._failed_fetches: Dict[str, Dict[str, Any]] = {}
+        # 直接HTTP请求连续回退到浏览器导航的次数
+        self._request_fallbacks = 0
 
         self._load_rules()
         self._parse_installed_mods()
 
     def log(self, message: str, level: str = "info"):
         log_entry = f"[{level.upper()}] {message}"
+        self._flush_logs()
         self.log_emitter.emit(log_entry)
         if level == "info":
             log.info(message)
@@ -179,6 +484,18 @@ class ModAnalyzer:
         elif level == "critical":
             log.critical(message)
 
+    def _log_buffered(self, message: str):
+        self._log_buffer.append(f"[INFO] {message}")
+        log.info(message)
+        if time.monotonic() - self._last_log_flush >= LOG_FLUSH_INTERVAL:
+            self._flush_logs()
+
+    def _flush_logs(self):
+        self._last_log_flush = time.monotonic()
+        if self._log_buffer:
+            self.log_emitter.emit('\n'.join(self._log_buffer))
+            self._log_buffer.clear()
+
     def _save_playwright_cookies_to_json(self, cookies: List[Dict]):
         """
         [新函数] 将Playwright格式的Cookies保存为JSON文件，以便快速加载。
@@ -199,64 +516,32 @@ class ModAnalyzer:
             self.log(f"'{dat_path.name}' 文件不存在。", "warning")
             return None
 
-        playwright_cookies = []
         try:
-            import struct
-            from http.cookies import SimpleCookie
-            with open(dat_path, 'rb') as f:
-                # 1. 读取 quint32 (4字节, big-endian) 的cookie数量
-                count_data = f.read(4)
-                if len(count_data) < 4:
-                    self.log("Cookies文件格式无效：无法读取数量。", "error")
-                    return None
-                cookie_count = struct.unpack('>I', count_data)[0]
-                self.log(f"在.dat文件中发现 {cookie_count} 个Cookies。")
-                self.log("注意: MO2默认读取的Cookies只包含API Cookies，无法使用较为高级的爬取功能")
-
-                # 2. 循环读取每个cookie
-                for _ in range(cookie_count):
-                    # 2a. 读取 QByteArray 的 quint32 (4字节) 长度前缀
-                    size_data = f.read(4)
-                    if len(size_data) < 4:
-                        break  # 文件提前结束
-                    byte_array_size = struct.unpack('>I', size_data)[0]
-
-                    # 2b. 读取原始cookie数据
-                    raw_cookie_bytes = f.read(byte_array_size)
-
-                    # 3. 解析原始cookie字符串
-                    # QNetworkCookie::toRawForm() 产生的是HTTP头格式的字符串
-                    # 使用 http.cookies.SimpleCookie 可以完美解析
-                    cookie = SimpleCookie()
-                    # 使用 latin-1 解码以避免Unicode错误，因为HTTP头是ASCII兼容的
-                    cookie.load(raw_cookie_bytes.decode('latin-1'))
-
-                    for name, morsel in cookie.items():
-                        # 4. 转换为Playwright格式的字典
-                        pw_cookie = {
-                            'name': morsel.key,
-                            'value': morsel.value,
-                            'domain': morsel['domain'],
-                            'path': morsel['path'],
-                            'secure': bool(morsel['secure']),
-                            'httpOnly': bool(morsel['httponly']),
-                            'sameSite': morsel['samesite'] if morsel['samesite'] else "None",  # 提供默认值
-                        }
-
-                        # 处理过期时间
-                        if morsel['expires']:
-                            try:
-                                # 解析 "Wdy, DD-Mon-YYYY HH:MM:SS GMT" 格式
-                                expires_dt = datetime.strptime(morsel['expires'], "%a, %d-%b-%Y %H:%M:%S %Z")
-                                # 转换为Unix时间戳（以秒为单位）
-                                pw_cookie['expires'] = expires_dt.timestamp()
-                            except ValueError:
-                                # 如果格式不同，则忽略过期时间
-                                pw_cookie['expires'] = -1
-                        else:
-                            pw_cookie['expires'] = -1
-
-                        playwright_cookies.append(pw_cookie)
+            data = dat_path.read_bytes()
+            # 1. 读取 quint32 (4字节, big-endian) 的cookie数量
+            if len(data) < 4:
+                self.log("Cookies文件格式无效：无法读取数量。", "error")
+                return None
+            cookie_count, = _UINT32_BE.unpack_from(data, 0)
+            self.log(f"在.dat文件中发现 {cookie_count} 个Cookies。")
+            self.log("注意: MO2默认读取的Cookies只包含API Cookies，无法使用较为高级的爬取功能")
+
+            # 2. 在内存中依次读取每个 QByteArray: quint32 长度前缀 + 原始cookie数据
+            playwright_cookies = []
+            offset, end = 4, len(data)
+            for _ in range(cookie_count):
+                if offset + 4 > end:
+                    break  # 文件提前结束
+                size, = _UINT32_BE.unpack_from(data, offset)
+                offset += 4
+                if size == 0xFFFFFFFF:  # 空 QByteArray
+                    continue
+                raw_cookie = data[offset:offset + size]
+                offset += size
+                # 3. QNetworkCookie::toRawForm() 产生的是 Set-Cookie 头格式的字符串
+                # 使用 latin-1 解码以避免Unicode错误，因为HTTP头是ASCII兼容的
+                if pw_cookie := self._parse_raw_cookie(raw_cookie.decode('latin-1')):
+                    playwright_cookies.append(pw_cookie)
 
             self.log(f"成功转换 {len(playwright_cookies)} 个Cookies。")
             return playwright_cookies
@@ -265,15 +550,63 @@ class ModAnalyzer:
             self.log(f"读取或转换 '{dat_path.name}' 时发生错误: {e}", "error")
             return None
 
+    @staticmethod
+    def _parse_raw_cookie(raw_cookie: str) -> Optional[Dict[str, Any]]:
+        """将 "name=value; domain=...; path=/; secure; HttpOnly" 形式的字符串转换为Playwright格式的字典。"""
+        parts = _COOKIE_PART_RE.findall(raw_cookie)
+        if not parts:
+            return None
+        first, *attribute_parts = parts
+        name, sep, value = first.partition('=')
+        name, value = name.strip(), value.strip()
+        if not sep or not name:
+            return None
+        # 与 SimpleCookie 相同，去掉值两侧的双引号并还原其中的转义字符
+        if len(value) >= 2 and value[0] == value[-1] == '"':
+            value = _COOKIE_ESCAPE_RE.sub(r'\1', value[1:-1])
+        attributes = {}
+        for part in attribute_parts:
+            key, _, attr_value = part.partition('=')
+            attributes[key.strip().lower()] = attr_value.strip()
+
+        expires = -1
+        if expires_text := attributes.get('expires'):
+            try:
+                # 解析 "Wdy, DD-Mon-YYYY HH:MM:SS GMT" 格式，并转换为Unix时间戳（以秒为单位）
+                expires = datetime.strptime(expires_text, "%a, %d-%b-%Y %H:%M:%S %Z").replace(
+                    tzinfo=timezone.utc).timestamp()
+            except ValueError:
+                pass  # 如果格式不同，则忽略过期时间
+
+        return {
+            'name': name,
+            'value': value,
+            'domain': attributes.get('domain', ''),
+            'path': attributes.get('path', ''),
+            'secure': 'secure' in attributes,
+            'httpOnly': 'httponly' in attributes,
+            'sameSite': (attributes.get('samesite') or "None").capitalize(),  # 提供默认值
+            'expires': expires,
+        }
+
     def _load_cookies_from_json(self) -> list | None:
         """尝试从插件自己的JSON缓存加载Cookies。"""
-        if not self.settings.COOKIES_PATH.exists():
+        cookies_path = self.settings.COOKIES_PATH
+        try:
+            mtime = cookies_path.stat().st_mtime_ns
+        except OSError:
             return None
-        
+
+        cached = ModAnalyzer._cookies_cache
+        if cached and cached[0] == str(cookies_path) and cached[1] == mtime:
+            self.log(f"'{cookies_path.name}' 未发生变化，复用已加载的Cookies。")
+            return cached[2]
+
         try:
-            with open(self.settings.COOKIES_PATH, 'r', encoding='utf-8') as f:
+            with open(cookies_path, 'r', encoding='utf-8') as f:
                 cookies = json.load(f)
-            self.log(f"成功从缓存 '{self.settings.COOKIES_PATH.name}' 加载Cookies。")
+            ModAnalyzer._cookies_cache = (str(cookies_path), mtime, cookies)
+            self.log(f"成功从缓存 '{cookies_path.name}' 加载Cookies。")
             return cookies
         except (json.JSONDecodeError, IOError):
             self.log("缓存的cookies.json文件无效或损坏。", "warning")
@@ -307,33 +640,36 @@ class ModAnalyzer:
 
         return self._load_cookies_from_json() or self._load_cookies_from_mo2_dat() or None
 
+    def _stop_browser(self):
+        try:
+            self.session.run(self.session.stop())
+        except Exception as e:
+            self.log(f"关闭浏览器时出错: {e}", "warning")
+
     def _launch_browser_with_cookies(self, cookies: list) -> bool:
         """使用给定的Cookies启动并配置Playwright浏览器。"""
+        if self.session is None:
+            self.session = BrowserSession(self.settings.BROWSER_PROFILE_DIR)
         try:
-            self.log("正在启动Playwright...")
-            self.playwright = PLAYWRIGHT_MODULE.sync_api.sync_playwright().start()
-            self.log("正在以无头模式启动浏览器...")
-            self.browser = self.playwright.chromium.launch(headless=True)
-            context = self.browser.new_context(
-                user_agent='Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/125.0.0.0 Safari/537.36'
-            )
-            context.add_cookies(cookies)
-            self.page = context.new_page()
+            self.log("正在以无头模式启动浏览器 (持久化用户目录)...")
+            self.session.run(self.session.start(cookies))
             self.log("浏览器启动并登录成功。")
             return True
         # 捕获所有可能的Playwright错误和通用异常
-        except (PLAYWRIGHT_MODULE.sync_api.Error, Exception) as e:
-            error_name = "Playwright" if isinstance(e, PLAYWRIGHT_MODULE.sync_api.Error) else "未知"
+        except (PLAYWRIGHT_MODULE.async_api.Error, Exception) as e:
+            error_name = "Playwright" if isinstance(e, PLAYWRIGHT_MODULE.async_api.Error) else "未知"
             self.log(f"初始化浏览器时发生{error_name}错误: {e}", "critical")
-            if hasattr(self, 'playwright') and self.playwright:
-                self.playwright.stop()
+            self._stop_browser()
             return False
 
     def _initialize_browser(self) -> bool:
         """
         初始化Playwright浏览器并处理登录。
-        高层逻辑: 获取Cookies -> 启动浏览器。
+        高层逻辑: 会话仍在运行则直接复用 -> 否则获取Cookies -> 启动浏览器。
         """
+        if self.session and self.session.is_alive:
+            self.log("复用已启动的浏览器会话。")
+            return True
         cookies = self._get_cookies()
         if cookies:
             return self._launch_browser_with_cookies(cookies)
@@ -348,38 +684,87 @@ class ModAnalyzer:
     def close(self):
         self.log("正在关闭分析器...")
         self._save_cache()
-        if self.browser:
-            self.browser.close()
-        if self.playwright:
-            self.playwright.stop()
+        if self.cache_db:
+            self.cache_db.close()
+            self.cache_db = None
+        if self._owns_session and self.session:
+            self.session.close()
+            self.session = None
         self.log("分析器已安全关闭。")
 
-    def _load_cache(self) -> Dict[str, Any]:
-        if not self.settings.CACHE_FILE_PATH.exists(): return {}
+    def _open_cache_db(self) -> Optional[ModCacheDB]:
         try:
-            with open(self.settings.CACHE_FILE_PATH, 'r', encoding='utf-8') as f:
-                self.log(f"成功加载缓存: {self.settings.CACHE_FILE_PATH.name}")
-                return json.load(f)
-        except (json.JSONDecodeError, IOError) as e:
-            self.log(f"加载缓存文件失败: {e}，将使用空缓存。", "error");
-            return {}
+            cache_db = ModCacheDB(self.settings.CACHE_DB_PATH)
+        except sqlite3.Error as e:
+            self.log(f"打开缓存数据库失败: {e}，本次分析将不使用磁盘缓存。", "error")
+            return None
+        self._migrate_json_cache(cache_db)
+        return cache_db
+
+    def _migrate_json_cache(self, cache_db: ModCacheDB):
+        """将旧版的JSON缓存文件一次性导入数据库，随后删除该文件。"""
+        json_path = self.settings.CACHE_FILE_PATH
+        try:
+            entries = _load_json_bytes(json_path.read_bytes())
+            if not isinstance(entries, dict): raise ValueError("缓存内容不是JSON对象")
+        except FileNotFoundError:
+            return
+        except (ValueError, OSError) as e:
+            # 无法导入的旧缓存改名保留，避免每次分析都重试并输出同样的警告
+            bad_path = json_path.with_name(json_path.name + '.corrupt')
+            try:
+                json_path.replace(bad_path)
+            except OSError:
+                pass
+            self.log(f"旧版缓存文件无法读取，已跳过迁移并改名为 '{bad_path.name}': {e}", "warning")
+            return
+        try:
+            if cache_db.is_empty():
+                cache_db.save_many(entries)
+                self.log(f"已将旧版缓存 '{json_path.name}' 迁移到 '{self.settings.CACHE_DB_PATH.name}'。")
+            json_path.unlink(missing_ok=True)
+        except (OSError, sqlite3.Error) as e:
+            self.log(f"迁移旧版缓存文件失败: {e}", "warning")
+
+    def _load_cached_entries(self, mod_ids: List[str]):
+        """从数据库中批量读取尚未载入内存的缓存条目。"""
+        if not self.cache_db: return
+        pending = [mod_id for mod_id in mod_ids if mod_id not in self.cache_data and mod_id not in self._db_checked]
+        if not pending: return
+        self._db_checked.update(pending)
+        try:
+            self.cache_data.update(self.cache_db.load_many(pending))
+        except (ValueError, sqlite3.Error) as e:
+            self.log(f"读取缓存数据库时出错: {e}", "error")
+
+    def _cached_entry(self, mod_id: str) -> Optional[Dict[str, Any]]:
+        if mod_id not in self.cache_data:
+            self._load_cached_entries([mod_id])
+        return self.cache_data.get(mod_id)
 
     def _save_cache(self):
+        # 只写入自上次保存以来新抓取的条目
+        if not self._unsaved_ids or not self.cache_db:
+            return
         try:
-            with open(self.settings.CACHE_FILE_PATH, 'w', encoding='utf-8') as f:
-                json.dump(self.cache_data, f, indent=4, ensure_ascii=False)
-                self.log(f"缓存已成功保存到: {self.settings.CACHE_FILE_PATH.name}")
-        except IOError as e:
+            self.cache_db.save_many({mod_id: self.cache_data[mod_id] for mod_id in self._unsaved_ids})
+            self.log(f"已将 {len(self._unsaved_ids)} 个新条目保存到缓存: {self.settings.CACHE_DB_PATH.name}")
+            self._unsaved_ids.clear()
+        except sqlite3.Error as e:
             self.log(f"保存缓存时出错: {e}", "error")
 
     def clear_cache(self):
         self.cache_data = {}
-        if self.settings.CACHE_FILE_PATH.exists():
-            try:
-                os.remove(self.settings.CACHE_FILE_PATH)
-                self.log(f"缓存文件 '{self.settings.CACHE_FILE_PATH.name}' 已被删除。")
-            except OSError as e:
-                self.log(f"删除缓存文件时出错: {e}", "error")
+        self._db_checked.clear()
+        self._unsaved_ids.clear()
+        self._resolved_mods.clear()
+        try:
+            if self.cache_db:
+                self.cache_db.clear()
+            self.settings.CACHE_FILE_PATH.unlink(missing_ok=True)
+            self.log(f"缓存 '{self.settings.CACHE_DB_PATH.name}' 已被清空。")
+        except (OSError, sqlite3.Error) as e:
+            self.log(f"清理缓存时出错: {e}", "error")
 
     def _load_rules(self):
         if not self.settings.RULES_PATH.exists():
@@ -387,34 +772,18 @@ class ModAnalyzer:
             self._create_default_rules_file()
             return
         self.log(f"正在从以下位置加载规则: {self.settings.RULES_PATH.name}")
-        config = configparser.ConfigParser(allow_no_value=True)
         try:
-            config.read(self.settings.RULES_PATH, encoding='utf-8')
-            if 'Ignore' in config: self.ignore_ids = {key for key in config['Ignore']}
-            if 'Replace' in config: self.replacement_map = {key: value for key, value in config['Replace'].items()}
+            ignore_ids, replacement_map = _read_rules_file(str(self.settings.RULES_PATH),
+                                                           self.settings.RULES_PATH.stat().st_mtime_ns)
+            # 复制一份，避免修改到缓存中的共享结果
+            self.ignore_ids, self.replacement_map = set(ignore_ids), dict(replacement_map)
             self.log(f"加载了 {len(self.ignore_ids)} 条 [Ignore] 和 {len(self.replacement_map)} 条 [Replace] 规则。")
-        except configparser.Error as e:
+        except (OSError, ValueError) as e:
             self.log(f"解析规则文件时出错: {e}", "error")
 
     def _create_default_rules_file(self):
-        template_content = textwrap.dedent(f"""
-        # 这是模组规则的配置文件。
-        # 您可以在MO2插件的数据目录中找到此文件：
-        # {self.settings.BASE_DIR}
-
-        [Ignore]
-        # 在此区域下的模组ID将被视为“已满足”，不会被报告为缺失。
-        # 示例：
-        # 12345
-
-        [Replace]
-        # 在此区域下，您可以定义替代关系。
-        # 格式为: 被替代的模组ID = 用来替代的模组ID
-        # 示例：一个旧的兼容补丁被一个整合版MOD取代
-        # 44444 = 55555
-        """)
         try:
-            self.settings.RULES_PATH.write_text(template_content.strip(), encoding='utf-8')
+            _write_default_rules_file(self.settings)
             self.log(f"已成功创建规则文件模板: {self.settings.RULES_PATH}")
         except IOError:
             self.log("创建规则文件模板失败！", "error")
@@ -424,16 +793,25 @@ class ModAnalyzer:
         mod_list = self.organizer.modList()
         enabled_mods = mod_list.allModsByProfilePriority()
 
+        # 每个模组都要跨越 Python/C++ 边界调用 MO2 API，循环内用到的方法提前绑定为局部变量
+        get_mod, folder_to_id, id_to_folders = mod_list.getMod, self.folder_to_id, self.id_to_folders
+        skipped = 0
         for mod_name in enabled_mods:
-            mod = mod_list.getMod(mod_name)
-            if mod and not mod.isSeparator() and mod.nexusId() > 0:
-                mod_id = str(mod.nexusId())
-                self.folder_to_id[mod_name] = mod_id
-                self.id_to_folders[mod_id].append(mod_name)
-            else:
-                self.log(f"跳过模组 '{mod_name}'，因为它是一个分隔符或缺少有效的Nexus ID。", "info")
+            mod = get_mod(mod_name)
+            if not mod or mod.isSeparator() or (nexus_id := mod.nexusId()) <= 0:
+                skipped += 1
+                continue
+            # ID 与文件夹名会作为键出现在多个映射和排序的内层循环中，驻留后相等比较可直接按对象身份完成
+            mod_id, mod_name = sys.intern(str(nexus_id)), sys.intern(mod_name)
+            folder_to_id[mod_name] = mod_id
+            id_to_folders[mod_id].append(mod_name)
+        if skipped:
+            self.log(f"跳过了 {skipped} 个分隔符或缺少有效Nexus ID的模组。", "info")
 
         self.installed_ids = set(self.folder_to_id.values())
+        # 与 _get_effective_id(x) in installed_ids 等价: 被替代的ID只看替代者是否已安装
+        self._satisfied_ids = {mod_id for mod_id in self.installed_ids if mod_id not in self.replacement_map} | {
+            req_id for req_id, effective_id in self.replacement_map.items() if effective_id in self.installed_ids}
         self.log(f"已加载 {len(self.installed_ids)} 个唯一的已安装模组ID。")
 
     def _is_cache_entry_valid(self, entry: Dict[str, Any]) -> bool:
@@ -445,183 +823,395 @@ class ModAnalyzer:
             return False
 
     @staticmethod
+    @functools.lru_cache(maxsize=4096)
     def _extract_mod_id_from_url(url: str) -> Optional[str]:
-
-        if match := re.search(r'/mods/(\d+)', url): return match.group(1)
+        # 同一个前置的URL会出现在许多模组的依赖列表中，解析结果按URL缓存
+        if match := _URL_RE.search(url): return sys.intern(match.group(1))
         return None
 
+    def _has_fresh_data(self, mod_id: str) -> bool:
+        return mod_id in self._resolved_mods or mod_id in self._failed_fetches or (
+                (entry := self._cached_entry(mod_id)) is not None and self._is_cache_entry_valid(entry))
+
     def get_mod_data(self, mod_id: str) -> Dict[str, Any]:
-        if mod_id in self.cache_data and self._is_cache_entry_valid(self.cache_data[mod_id]):
-            return self.cache_data[mod_id]
+        if (entry := self._resolved_mods.get(mod_id)) is not None:
+            return entry
+        entry = self._cached_entry(mod_id)
+        if entry is None or not self._is_cache_entry_valid(entry):
+            if mod_id in self._failed_fetches:
+                entry = self._failed_fetches[mod_id]
+            else:
+                self.fetch_mod_data([mod_id])
+                # 刷新失败时返回失败结果，而不是继续使用已过期的缓存条目
+                entry = self._failed_fetches.get(mod_id) or self.cache_data[mod_id]
+        self._resolved_mods[mod_id] = entry
+        return entry
 
-        self.log(f"[在线抓取] {mod_id}")
-        if not self.page: raise ConnectionError("Playwright 页面未初始化。")
+    def fetch_mod_data(self, mod_ids: List[str]):
+        """
+        并发抓取所有尚未缓存的模组页面，结果写入 cache_data。
+        """
+        mod_ids = list(dict.fromkeys(mod_ids))
+        # 整批ID一次查询数据库，而不是逐个查询
+        self._load_cached_entries(mod_ids)
+        pending = [mod_id for mod_id in mod_ids if not self._has_fresh_data(mod_id)]
+        if not pending: return
+        if not self.session or not self.session.is_alive: raise ConnectionError("Playwright 浏览器上下文未初始化。")
+        try:
+            self.session.run(self._scrape_mod_pages(pending))
+        finally:
+            self._flush_logs()
+        if len(self._unsaved_ids) >= CACHE_FLUSH_INTERVAL:
+            self._save_cache()
+
+    async def _scrape_mod_pages(self, mod_ids: List[str]):
+        semaphore = asyncio.Semaphore(self.settings.MAX_CONCURRENT_REQUESTS)
+        completed = 0
+
+        async def scrape(mod_id: str):
+            nonlocal completed
+            async with semaphore:
+                await self._scrape_mod_page(mod_id)
+            completed += 1
+            if len(mod_ids) > 1 and (completed % 10 == 0 or completed == len(mod_ids)):
+                self._log_buffered(f"[进度] {completed}/{len(mod_ids)}")
+                self._flush_logs()
+
+        try:
+            await asyncio.gather(*(scrape(mod_id) for mod_id in mod_ids))
+        finally:
+            await self.session.park_idle_pages()
 
+    async def _scrape_mod_page(self, mod_id: str):
+        self._log_buffered(f"[在线抓取] {mod_id}")
         url = f"{self.settings.NEXUS_BASE_URL}/{self.settings.GAME_NAME}/mods/{mod_id}"
         try:
-            self.page.goto(url, wait_until='domcontentloaded', timeout=self.settings.REQUEST_TIMEOUT)
-            self.page.wait_for_selector('#pagetitle > h1', timeout=15000)
-            soup = BS4_MODULE.BeautifulSoup(self.page.content(), 'html.parser')
-
-            title_element = soup.select_one('#pagetitle > h1')
-            mod_name = title_element.get_text(strip=True) if title_element else "未知模组名称"
-
-            category_items = soup.select("ul#breadcrumb li a")
-            category = category_items[-1].get_text(strip=True) if len(category_items) > 1 else "Default"
-
-            def scrape_dep_section(header_text: str) -> List[Dict[str, str]]:
-                dependencies = []
-                header = soup.find('h3', string=lambda t: bool(t) and header_text.lower() in t.lower().strip())
-                if header and (table := header.find_next_sibling('table', class_='desc-table')):
-                    for row in table.select('tbody tr'):
-                        if (name_cell := row.find('td', class_='table-require-name')) and (link := name_cell.find('a')):
-                            dep_url = link['href'] if link['href'].startswith(
-                                'http') else self.settings.NEXUS_BASE_URL + link['href']
-                            notes = (notes_cell.get_text(strip=True) if (
-                                notes_cell := row.find('td', class_='table-require-notes')) else "")
-                            dependencies.append({'name': link.get_text(strip=True), 'url': dep_url, 'notes': notes})
-                return dependencies
-
-            new_entry = {
-                "name": mod_name, "category": category, "timestamp": datetime.now().isoformat(),
-                "dependencies": {'requires': scrape_dep_section('Nexus requirements'),
-                                 'required_by': scrape_dep_section('Mods requiring this file')}
-            }
+            new_entry = await self._fetch_page_via_request(url) or await self._fetch_page_via_browser(url)
             self.cache_data[mod_id] = new_entry
-            self.log(f"[已抓取] {mod_name} ({mod_id})")
-            return new_entry
+            self._unsaved_ids.add(mod_id)
+            self._log_buffered(f"[已抓取] {new_entry['name']} ({mod_id})")
         except Exception as e:
             self.log(f"[抓取失败] {mod_id}: {type(e).__name__}", "error")
-            return {"name": f"抓取失败: ID {mod_id}", "error": str(e), "category": "Default", "dependencies": {}}
+            self._failed_fetches[mod_id] = {"name": f"抓取失败: ID {mod_id}", "error": str(e), "category": "Default",
+                                            "dependencies": {}}
+
+    async def _fetch_page_via_request(self, url: str) -> Optional[Dict[str, Any]]:
+        """
+        通过浏览器上下文自带的HTTP客户端直接请求页面 (共享Cookies，不渲染、不执行JS)。
+        若请求失败或返回的HTML中没有模组标题 (例如被验证页面拦截)，返回 None 以便回退到完整的页面导航。
+        """
+        if self._request_fallbacks >= REQUEST_FALLBACK_LIMIT:
+            return None
+        new_entry = None
+        try:
+            response = await self.session.context.request.get(url, timeout=self.settings.REQUEST_TIMEOUT)
+            # 响应体会一直保留在 (跨分析复用的) 浏览器上下文中，读取后立即释放
+            try:
+                html = await response.text() if response.ok else None
+            finally:
+                await response.dispose()
+            if html is not None:
+                new_entry = await asyncio.to_thread(self._parse_mod_page, html)
+        except PLAYWRIGHT_MODULE.async_api.Error:
+            pass
+        if new_entry:
+            self._request_fallbacks = 0
+            return new_entry
+        self._request_fallbacks += 1
+        if self._request_fallbacks == REQUEST_FALLBACK_LIMIT:
+            self._log_buffered("直接请求页面多次失败，本次分析余下的模组将改用浏览器加载。")
+        return None
+
+    async def _acquire_page(self) -> PLAYWRIGHT_MODULE.async_api.Page:
+        idle_pages = self.session.idle_pages
+        while idle_pages:
+            page = idle_pages.pop()
+            if not page.is_closed():
+                return page
+        return await self.session.context.new_page()
+
+    async def _fetch_page_via_browser(self, url: str) -> Dict[str, Any]:
+        page = await self._acquire_page()
+        try:
+            await page.goto(url, wait_until='domcontentloaded', timeout=self.settings.REQUEST_TIMEOUT)
+            await page.wait_for_selector('#pagetitle > h1', timeout=15000)
+            if new_entry := await asyncio.to_thread(self._parse_mod_page, await page.content()):
+                return new_entry
+            raise ValueError("页面中未找到模组标题。")
+        finally:
+            self.session.idle_pages.append(page)
+
+    def _parse_mod_page(self, html: str) -> Optional[Dict[str, Any]]:
+        """解析模组页面HTML。不访问浏览器对象，可在线程池中执行。"""
+        if LEXBOR_PARSER is not None:
+            return self._parse_mod_page_lexbor(html)
+        soup = BS4_MODULE.BeautifulSoup(html, BS4_PARSER)
+
+        title_element = _SEL_TITLE.select_one(soup)
+        if not title_element:
+            return None
+        mod_name = title_element.get_text(strip=True)
+
+        category_items = _SEL_BREADCRUMB.select(soup)
+        # 面包屑中的分类名可能包含换行或连续空白 (含 &nbsp;)，规范化后才能匹配 CATEGORY_PRIORITIES
+        category = _WHITESPACE_RE.sub(' ', category_items[-1].get_text(strip=True)) if len(category_items) > 1 else "Default"
+
+        # 一次遍历同时找到两个依赖表格的标题，找齐后立即停止
+        headers = {}
+        for h3 in soup.find_all('h3'):
+            text = h3.get_text().lower()
+            for header_text, section in _DEP_SECTIONS:
+                if section not in headers and header_text in text:
+                    headers[section] = h3
+            if len(headers) == len(_DEP_SECTIONS): break
+
+        def scrape_dep_section(section: str) -> List[Dict[str, str]]:
+            dependencies = []
+            header = headers.get(section)
+            if header and (table := header.find_next_sibling('table', class_='desc-table')):
+                for row in _SEL_TABLE_ROWS.select(table):
+                    # 一次遍历行内的单元格，按 class 同时找出名称列与备注列
+                    name_cell = notes_cell = None
+                    for td in row.find_all('td', recursive=False):
+                        td_classes = td.get('class') or ()
+                        if 'table-require-name' in td_classes:
+                            name_cell = td
+                        elif 'table-require-notes' in td_classes:
+                            notes_cell = td
+                    if name_cell is not None and (link := name_cell.find('a')):
+                        dep_url = link['href'] if link['href'].startswith(
+                            'http') else self.settings.NEXUS_BASE_URL + link['href']
+                        notes = notes_cell.get_text(strip=True) if notes_cell is not None else ""
+                        dependencies.append({'name': link.get_text(strip=True), 'url': dep_url, 'notes': notes})
+            return dependencies
+
+        return {
+            "name": mod_name, "category": category, "timestamp": datetime.now().isoformat(),
+            "dependencies": {section: scrape_dep_section(section) for _, section in _DEP_SECTIONS}
+        }
+
+    def _parse_mod_page_lexbor(self, html: str) -> Optional[Dict[str, Any]]:
+        """与 _parse_mod_page 相同的解析逻辑，基于 selectolax 的 Lexbor 引擎。"""
+        tree = LEXBOR_PARSER(html)
+
+        title_element = tree.css_first('#pagetitle > h1')
+        if not title_element:
+            return None
+        mod_name = title_element.text(strip=True)
+
+        category_items = tree.css('ul#breadcrumb li a')
+        category = _WHITESPACE_RE.sub(' ', category_items[-1].text(strip=True)) if len(category_items) > 1 else "Default"
+        headers = {}
+        for h3 in tree.css('h3'):
+            text = h3.text().lower()
+            for header_text, section in _DEP_SECTIONS:
+                if section not in headers and header_text in text:
+                    headers[section] = h3
+            if len(headers) == len(_DEP_SECTIONS): break
+
+        def scrape_dep_section(section: str) -> List[Dict[str, str]]:
+            dependencies = []
+            header = headers.get(section)
+            table = header.next if header else None
+            while table is not None and not (table.tag == 'table' and 'desc-table' in (table.attributes.get('class') or '').split()):
+                table = table.next
+            if table is not None:
+                for row in table.css('tbody tr'):
+                    name_cell = notes_cell = None
+                    for td in row.iter():
+                        if td.tag != 'td': continue
+                        td_classes = (td.attributes.get('class') or '').split()
+                        if 'table-require-name' in td_classes:
+                            name_cell = td
+                        elif 'table-require-notes' in td_classes:
+                            notes_cell = td
+                    if name_cell is not None and (link := name_cell.css_first('a')):
+                        href = link.attributes.get('href') or ''
+                        dep_url = href if href.startswith('http') else self.settings.NEXUS_BASE_URL + href
+                        notes = notes_cell.text(strip=True) if notes_cell is not None else ""
+                        dependencies.append({'name': link.text(strip=True), 'url': dep_url, 'notes': notes})
+            return dependencies
+
+        return {
+            "name": mod_name, "category": category, "timestamp": datetime.now().isoformat(),
+            "dependencies": {section: scrape_dep_section(section) for _, section in _DEP_SECTIONS}
+        }
 
     def _get_effective_id(self, required_id: str) -> str:
         return self.replacement_map.get(required_id, required_id)
 
     def _is_dependency_satisfied(self, required_id: str) -> bool:
-        return self._get_effective_id(required_id) in self.installed_ids
+        return required_id in self._satisfied_ids
 
     def analyze_single_mod_dependencies(self, initial_mod_id: str) -> str:
         self.log(f"--- 开始分析单个模组的缺失依赖 (ID: {initial_mod_id}) ---")
-        dependency_tree = self._build_dependency_tree(initial_mod_id, set())
+        self._prefetch_dependency_closure(initial_mod_id)
+        dependency_tree = self._build_dependency_tree(initial_mod_id, set(), {})
         output_path = self.settings.BASE_DIR / f"dependency_tree_{initial_mod_id}.html"
         self._generate_tree_html_report(dependency_tree, output_path)
         self.log(f"--- 依赖树分析完成。报告已生成: {output_path.resolve()} ---", "info")
         return str(output_path.resolve())
 
-    def _build_dependency_tree(self, mod_id: str, visited_ids: Set[str]) -> Dict[str, Any]:
-        node: Dict[str, Any] = {"id": mod_id, "name": "加载中...", "children": []}
-        if mod_id in visited_ids:
-            node.update({"name": "检测到循环依赖", "status": "cycle"});
-            return node
+    def _prefetch_dependency_closure(self, root_id: str):
+        """
+        按层并发抓取依赖树中会用到的所有模组页面 (包括替代模组)，之后的递归构建只会命中缓存。
+        """
+        frontier, seen = [root_id], set()
+        while frontier:
+            frontier = [nid for nid in dict.fromkeys(frontier) if nid not in seen]
+            seen.update(frontier)
+            self.fetch_mod_data(frontier + [self._get_effective_id(nid) for nid in frontier])
+            next_frontier = []
+            for current_id in frontier:
+                if current_id in self.ignore_ids: continue
+                for req in self.get_mod_data(current_id).get("dependencies", {}).get("requires", []):
+                    if req_id := self._extract_mod_id_from_url(req['url']):
+                        next_frontier.append(req_id)
+            frontier = next_frontier
+
+    def _build_dependency_tree(self, mod_id: str, on_stack: Set[str],
+                               built_subtrees: Dict[str, TreeNode]) -> TreeNode:
+        """
+        递归构建依赖树。on_stack 为当前递归路径上的模组，进入时加入、返回前移除，整个遍历共用一个集合。
+        不含循环的子树与到达它的路径无关，会按模组ID记忆在 built_subtrees 中，
+        菱形依赖中被多个模组共同需要的前置只会构建一次。
+        """
+        if mod_id in on_stack:
+            return TreeNode(mod_id, "检测到循环依赖", "cycle")
+        if (built := built_subtrees.get(mod_id)) is not None:
+            return copy.copy(built)  # 浅拷贝，父节点会单独写入自己的 notes
 
-        visited_ids.add(mod_id)
         mod_data = self.get_mod_data(mod_id)
-        node['name'] = mod_data.get("name", f"ID: {mod_id}")
+        node = TreeNode(mod_id, mod_data.get("name", f"ID: {mod_id}"))
 
         effective_id = self._get_effective_id(mod_id)
-        node['replacement_info'] = None
         if mod_id != effective_id:
             replacer_data = self.get_mod_data(effective_id)
-            node['replacement_info'] = {"name": replacer_data.get('name', f'ID {effective_id}'), "id": effective_id}
+            node.replacement_info = {"name": replacer_data.get('name', f'ID {effective_id}'), "id": effective_id}
 
-        status = "missing"
         if mod_id in self.ignore_ids:
-            status = "ignored"
+            node.status = "ignored"
         elif effective_id in self.installed_ids:
-            status = "satisfied"
-        node['status'] = status
+            node.status = "satisfied"
 
-        if status in ('ignored', 'cycle') or "dependencies" not in mod_data:
+        if node.status == 'ignored' or "dependencies" not in mod_data:
+            built_subtrees[mod_id] = node
             return node
 
+        on_stack.add(mod_id)
         for req in mod_data.get("dependencies", {}).get("requires", []):
             if req_id := self._extract_mod_id_from_url(req['url']):
-                child_node = self._build_dependency_tree(req_id, visited_ids.copy())
-                child_node['notes'] = req.get('notes', '')
-                node["children"].append(child_node)
+                child_node = self._build_dependency_tree(req_id, on_stack, built_subtrees)
+                child_node.notes = req.get('notes', '')
+                node.children.append(child_node)
+        on_stack.discard(mod_id)
+        # 只有所有子树都已被记忆 (即不含循环) 时，当前子树才可复用
+        if all(child.id in built_subtrees for child in node.children):
+            built_subtrees[mod_id] = node
         return node
 
-    def _generate_tree_html_report(self, tree_data: Dict[str, Any], output_path: Path):
+    def _generate_tree_html_report(self, tree_data: TreeNode, output_path: Path):
         self.log(f"正在为依赖树生成HTML报告 -> {output_path}")
 
-        def render_node(node: Dict[str, Any]) -> str:
-            status_map = {"satisfied": ("satisfied", "✔"), "missing": ("missing", "❌"), "ignored": ("ignored", "➖"),
-                          "cycle": ("cycle", "LOOP")}
-            status_class, status_icon = status_map.get(node.get("status", "missing"), ("missing", "❌"))
-            original_mod_name = node['name']
-            original_mod_id = node['id']
-            original_nexus_url = f"{self.settings.NEXUS_BASE_URL}/{self.settings.GAME_NAME}/mods/{original_mod_id}"
-            if r_info := node.get('replacement_info'):
-                replacer_name = r_info['name']
+        status_map = {"satisfied": ("satisfied", "✔"), "missing": ("missing", "❌"), "ignored": ("ignored", "➖"),
+                      "cycle": ("cycle", "LOOP")}
+        nexus_base = f"{self.settings.NEXUS_BASE_URL}/{self.settings.GAME_NAME}/mods/"
+
+        # 用显式栈代替递归，依赖链再深也不会触及递归深度上限；所有片段直接写入同一个内存缓冲区
+        # 栈元素为 (节点, 是否为闭合阶段): 打开阶段输出节点本身并压入子节点，闭合阶段输出结束标签
+        buf = io.StringIO()
+        write = buf.write
+        write(f"<h1>模组缺失依赖树报告 (起始模组: {tree_data.name.translate(_ESCAPE_TABLE)})</h1><ul>")
+        stack = [(tree_data, False)]
+        while stack:
+            node, closing = stack.pop()
+            if closing:
+                write("</ul></li>" if node.children else "</li>")
+                continue
+            status_class, status_icon = status_map.get(node.status, ("missing", "❌"))
+            original_mod_name = node.name.translate(_ESCAPE_TABLE)
+            original_mod_id = node.id
+            original_nexus_url = nexus_base + original_mod_id
+            if r_info := node.replacement_info:
+                replacer_name = r_info['name'].translate(_ESCAPE_TABLE)
                 replacer_id = r_info['id']
-                replacer_nexus_url = f"{self.settings.NEXUS_BASE_URL}/{self.settings.GAME_NAME}/mods/{replacer_id}"
+                replacer_nexus_url = nexus_base + replacer_id
                 main_text = f"<a href='{replacer_nexus_url}' target='_blank'>{replacer_name}</a> (ID: {replacer_id})"
                 sub_text = f" <span class='replacement-info'>(作为 <a href='{original_nexus_url}'>{original_mod_name}</a> 的替代)</span>"
             else:
                 main_text = f"<a href='{original_nexus_url}' target='_blank'>{original_mod_name}</a> (ID: {original_mod_id})"
                 sub_text = ""
-            notes_html = f" <span class='notes'>({node.get('notes', '')})</span>" if node.get('notes') else ""
-            html = f"<li class='{status_class}'><span class='icon'>{status_icon}</span> {main_text}{sub_text}{notes_html}"
-            if node["children"]:
-                html += "<ul>" + "".join([render_node(child) for child in node["children"]]) + "</ul>"
-            return html + "</li>"
-
-        html_content = f"""
-        <!DOCTYPE html><html lang="zh-CN"><head><meta charset="UTF-8"><title>模组缺失依赖树报告</title><style>{textwrap.dedent("""
-            body{font-family: -apple-system, BlinkMacSystemFont, "Segoe UI", sans-serif; padding:20px; line-height: 1.6;} h1{text-align:center;border-bottom:2px solid #3498db;padding-bottom:10px} ul{list-style-type:none;padding-left:25px;border-left:1px dashed #ccc} li{margin:10px 0} a{text-decoration:none;color:#2980b9} a:hover{text-decoration:underline} .icon{display:inline-block;width:24px;text-align:center;margin-right:8px;font-size:1.2em} .notes{font-style:italic;color:#7f8c8d;font-size:0.9em} .replacement-info, .replacement-info a{font-style:italic;color:#3498db;font-size:0.9em; font-weight: bold;} .satisfied{color:#27ae60} .missing{color:#c0392b} .ignored{color:#7f8c8d} .cycle{color:#f39c12}
-        """)}</style></head><body>
-        <h1>模组缺失依赖树报告 (起始模组: {tree_data['name']})</h1><ul>{render_node(tree_data)}</ul><hr>
-        <p>图例: <span class="satisfied">✔ 已满足</span> | <span class="missing">❌ 缺失</span> | <span class="ignored">➖ 已忽略</span> | <span class="cycle">LOOP 循环依赖</span></p>
-        </body></html>"""
-        output_path.write_text(textwrap.dedent(html_content).strip(), encoding='utf-8')
+            notes_html = f" <span class='notes'>({node.notes.translate(_ESCAPE_TABLE)})</span>" if node.notes else ""
+            write(f"<li class='{status_class}'><span class='icon'>{status_icon}</span> {main_text}{sub_text}{notes_html}")
+            stack.append((node, True))
+            if node.children:
+                write("<ul>")
+                stack.extend((child, False) for child in reversed(node.children))
+
+        write('</ul><hr>\n<p>图例: <span class="satisfied">✔ 已满足</span> | <span class="missing">❌ 缺失</span> | <span class="ignored">➖ 已忽略</span> | <span class="cycle">LOOP 循环依赖</span></p>\n</body></html>')
+        # 预编码的文件头直接写入，其余内容一次编码
+        with open(output_path, 'wb') as f:
+            f.write(_TREE_REPORT_HEAD)
+            f.write(buf.getvalue().encode('utf-8'))
 
     def generate_sorted_load_order(self) -> str:
         self.log("--- 开始对MO2模组进行终极分类拓扑排序 ---")
         if not self.folder_to_id:
             self.log("未找到任何带有有效ID的已启用模组，无法生成排序。", "error");
             return ""
-        full_graph, reverse_graph, all_nodes = self._build_full_dependency_network()
-        missing_mods_report = self._identify_missing_dependencies(all_nodes, reverse_graph)
-        sorted_order, cyclic_nodes = self._perform_topological_sort(full_graph)
+        graph_ids, graph_notes, reverse_ids, reverse_notes, all_nodes = self._build_full_dependency_network()
+        missing_mods_report = self._identify_missing_dependencies(all_nodes, reverse_ids, reverse_notes)
+        sorted_order, cyclic_nodes, cycle_path = self._perform_topological_sort(graph_ids)
         output_path = self.settings.BASE_DIR / "suggested_load_order.html"
-        self._generate_sort_html_report(sorted_order, cyclic_nodes, missing_mods_report, full_graph, output_path)
+        self._generate_sort_html_report(sorted_order, cyclic_nodes, cycle_path, missing_mods_report, graph_ids,
+                                        graph_notes, output_path)
         self.log(f"--- 排序分析完成。报告已生成: {output_path.resolve()} ---", "info")
         return str(output_path.resolve())
 
-    def _build_full_dependency_network(self) -> Tuple[defaultdict, defaultdict, set]:
+    def _build_full_dependency_network(self) -> Tuple[defaultdict, defaultdict, defaultdict, defaultdict, set]:
+        """
+        构建正向与反向依赖图。每个方向都以两个按下标对齐的列表保存 (模组ID列表, 备注列表)，
+        排序只遍历ID列表，备注仅在生成报告时使用。
+        """
         self.log("--- 正在构建完整依赖网络... ---")
-        graph, reverse_graph = defaultdict(list), defaultdict(list)
-        nodes_to_process = deque(self.installed_ids)
+        graph_ids, graph_notes = defaultdict(list), defaultdict(list)
+        reverse_ids, reverse_notes = defaultdict(list), defaultdict(list)
+        frontier = list(self.installed_ids)
         processed_nodes = set()
-        while nodes_to_process:
-            current_id = nodes_to_process.popleft()
-            if current_id in processed_nodes: continue
-            processed_nodes.add(current_id)
-            mod_data = self.get_mod_data(current_id)
-            if "dependencies" in mod_data:
-                for req in mod_data.get("dependencies", {}).get("requires", []):
-                    if req_id := self._extract_mod_id_from_url(req['url']):
-                        notes = req.get('notes', '')
-                        graph[current_id].append({'id': req_id, 'notes': notes})
-                        reverse_graph[req_id].append({'id': current_id, 'notes': notes})
-                        if req_id not in processed_nodes: nodes_to_process.append(req_id)
-        return graph, reverse_graph, processed_nodes
-
-    def _identify_missing_dependencies(self, all_nodes: Set[str], reverse_graph: defaultdict) -> Dict[str, Dict]:
-        unmet_dependencies = {nid for nid in all_nodes if
-                              not self._is_dependency_satisfied(nid) and nid not in self.ignore_ids}
+        # 按层进行广度优先遍历，每一层未缓存的模组页面会被并发抓取
+        while frontier:
+            frontier = [nid for nid in dict.fromkeys(frontier) if nid not in processed_nodes]
+            self.fetch_mod_data(frontier)
+            next_frontier = []
+            for current_id in frontier:
+                processed_nodes.add(current_id)
+                mod_data = self.get_mod_data(current_id)
+                if "dependencies" in mod_data:
+                    for req in mod_data.get("dependencies", {}).get("requires", []):
+                        if req_id := self._extract_mod_id_from_url(req['url']):
+                            notes = req.get('notes', '')
+                            graph_ids[current_id].append(req_id)
+                            graph_notes[current_id].append(notes)
+                            reverse_ids[req_id].append(current_id)
+                            reverse_notes[req_id].append(notes)
+                            if req_id not in processed_nodes: next_frontier.append(req_id)
+            frontier = next_frontier
+        return graph_ids, graph_notes, reverse_ids, reverse_notes, processed_nodes
+
+    def _identify_missing_dependencies(self, all_nodes: Set[str], reverse_ids: defaultdict,
+                                       reverse_notes: defaultdict) -> Dict[str, Dict]:
+        effective_id_of, installed_ids, ignore_ids = self.replacement_map.get, self.installed_ids, self.ignore_ids
+        unmet_dependencies = all_nodes - self._satisfied_ids - ignore_ids
         if not unmet_dependencies: return {}
         self.log(f"检测到 {len(unmet_dependencies)} 个未满足的前置需求。", "warning")
         missing_report = {}
-        for unmet_id in sorted(list(unmet_dependencies)):
+        for unmet_id in sorted(unmet_dependencies):
             req_by_installed, req_by_missing = [], set()
-            for req_info in reverse_graph.get(unmet_id, []):
-                req_by_id = req_info['id']
-                notes = req_info['notes']
-                if req_by_id in self.installed_ids:
+            for req_by_id, notes in zip(reverse_ids.get(unmet_id, ()), reverse_notes.get(unmet_id, ())):
+                if req_by_id in installed_ids:
                     for folder_name in self.id_to_folders.get(req_by_id, []):
                         req_by_installed.append((folder_name, notes))
-                elif self._get_effective_id(req_by_id) in unmet_dependencies:
+                elif effective_id_of(req_by_id, req_by_id) in unmet_dependencies:
                     req_by_missing.add((self.get_mod_data(req_by_id).get("name", f"ID {req_by_id}"), req_by_id))
             effective_id = self._get_effective_id(unmet_id)
             report_entry = {
@@ -634,63 +1224,116 @@ class ModAnalyzer:
             missing_report[unmet_id] = report_entry
         return missing_report
 
-    def _perform_topological_sort(self, full_graph: defaultdict) -> Tuple[List[str], List[str]]:
+    def _get_category_priority(self, mod_id: str) -> int:
+        if (priority := self._priority_by_id.get(mod_id)) is None:
+            category = self.get_mod_data(mod_id).get("category", "Default")
+            priority = self._priority_by_id[mod_id] = self.settings.CATEGORY_PRIORITIES.get(category, 50)
+        return priority
+
+    def _build_folder_graph(self, graph_ids: defaultdict) -> Tuple[List[str], List[List[int]], List[int]]:
+        """
+        为每个模组文件夹分配整数编号，并一次遍历构建按编号索引的反向邻接表 (前置 -> 依赖它的模组) 与入度表。
+        编号按排序键 (分类优先级, 文件夹名) 递增分配，整数的大小关系即排序键的大小关系；重复声明的依赖只计一次入度。
+        """
+        folder_to_id = self.folder_to_id
+        folders = sorted(folder_to_id, key=lambda f: (self._get_category_priority(folder_to_id[f]), f))
+        index_of = {folder: index for index, folder in enumerate(folders)}
+        dependents: List[List[int]] = [[] for _ in folders]
+        in_degree = [0] * len(folders)
+        # 内层循环按边执行，方法与属性查找提前绑定为局部变量
+        effective_id_of, satisfied_ids, folders_of = self.replacement_map.get, self._satisfied_ids, self.id_to_folders.get
+        for dep_index, dep_folder in enumerate(folders):
+            providers = {index_of[provider_folder]
+                         for req_id in graph_ids.get(folder_to_id[dep_folder], ()) if req_id in satisfied_ids
+                         for provider_folder in folders_of(effective_id_of(req_id, req_id), ()) if provider_folder in index_of}
+            for provider_index in providers:
+                dependents[provider_index].append(dep_index)
+            in_degree[dep_index] = len(providers)
+        return folders, dependents, in_degree
+
+    def _perform_topological_sort(self, graph_ids: defaultdict) -> Tuple[List[str], List[str], List[str]]:
         self.log("--- 正在执行带权重的全局拓扑排序... ---")
-        graph, in_degree = defaultdict(list), {f: 0 for f in self.folder_to_id}
-        for dep_folder, dep_id in self.folder_to_id.items():
-            for req_info in full_graph.get(dep_id, []):
-                req_id = req_info['id']
-                if not self._is_dependency_satisfied(req_id): continue
-                actual_provider_id = self._get_effective_id(req_id)
-                for provider_folder in self.id_to_folders.get(actual_provider_id, []):
-                    if provider_folder in in_degree:
-                        graph[provider_folder].append(dep_folder)
-                        in_degree[dep_folder] += 1
-        ready_queue = []
-        for folder, degree in in_degree.items():
+        folders, dependents, in_degree = self._build_folder_graph(graph_ids)
+        # 大多数模组既没有前置也不被依赖，不进入堆；按编号递增收集，两个列表都已有序 (有序列表即满足堆的性质)
+        isolated, ready_queue = [], []
+        for index, degree in enumerate(in_degree):
             if degree == 0:
-                mod_id = self.folder_to_id[folder]
-                priority = self.settings.CATEGORY_PRIORITIES.get(self.get_mod_data(mod_id).get("category", "Default"),
-                                                                 50)
-                heapq.heappush(ready_queue, (priority, folder))
-        sorted_order = []
+                (ready_queue if dependents[index] else isolated).append(index)
+        # 小根堆只处理参与依赖关系的模组，堆中直接比较整数编号
+        order, iso_index = [], 0
         while ready_queue:
-            _, u_folder = heapq.heappop(ready_queue)
-            sorted_order.append(u_folder)
-            for v_folder in graph.get(u_folder, []):
-                in_degree[v_folder] -= 1
-                if in_degree[v_folder] == 0:
-                    v_prio = self.settings.CATEGORY_PRIORITIES.get(
-                        self.get_mod_data(self.folder_to_id[v_folder]).get("category", "Default"), 50)
-                    heapq.heappush(ready_queue, (v_prio, v_folder))
-        cyclic_nodes = [f for f, d in in_degree.items() if d > 0]
+            # 与孤立模组按相同的编号归并，结果与全部模组入堆时完全一致
+            if iso_index < len(isolated) and isolated[iso_index] < ready_queue[0]:
+                order.append(isolated[iso_index])
+                iso_index += 1
+                continue
+            u = heapq.heappop(ready_queue)
+            order.append(u)
+            for v in dependents[u]:
+                in_degree[v] -= 1
+                if in_degree[v] == 0:
+                    heapq.heappush(ready_queue, v)
+        order.extend(isolated[iso_index:])
+        sorted_order = [folders[index] for index in order]
+        # Kahn 算法结束后入度仍大于0的模组处于循环中或依赖于循环，无需单独的环检测遍历
+        cyclic_indices = [index for index, degree in enumerate(in_degree) if degree > 0]
+        remaining = {folders[index] for index in cyclic_indices}
+        cyclic_nodes = [f for f in self.folder_to_id if f in remaining]
+        cycle_path: List[str] = []
         if cyclic_nodes:
             self.log(f"检测到循环依赖！涉及的模组: {', '.join(cyclic_nodes)}", "error")
-        return sorted_order, cyclic_nodes
+            cycle_path = self._find_cycle_path(cyclic_indices, dependents, folders)
+            self.log(f"其中一条循环路径: {' -> '.join(cycle_path)}", "error")
+        return sorted_order, cyclic_nodes, cycle_path
 
-    def _generate_sort_html_report(self, sorted_order, cyclic_nodes, missing_report, full_graph, output_path):
+    @staticmethod
+    def _find_cycle_path(cyclic_indices: List[int], dependents: List[List[int]], folders: List[str]) -> List[str]:
+        """
+        仅在排序剩余的模组上查找一条具体的循环路径，用于报告。
+        剩余模组都至少有一个同样剩余的前置，因此沿前置回溯必然会回到已走过的模组。
+        返回的路径中每个模组都依赖于下一个模组，首尾相同。
+        """
+        remaining = set(cyclic_indices)
+        providers: Dict[int, List[int]] = defaultdict(list)
+        for provider in cyclic_indices:
+            for dependent in dependents[provider]:
+                if dependent in remaining:
+                    providers[dependent].append(provider)
+        # 按文件夹名选取起点与前置，使报告中的路径稳定
+        by_name = folders.__getitem__
+        walk, position = [], {}
+        node = min(remaining, key=by_name)
+        while node not in position:
+            position[node] = len(walk)
+            walk.append(node)
+            node = min(providers[node], key=by_name)
+        return [folders[index] for index in walk[position[node]:]] + [folders[node]]
+
+    def _generate_sort_html_report(self, sorted_order, cyclic_nodes, cycle_path, missing_report, graph_ids,
+                                   graph_notes, output_path):
         self.log(f"正在生成终极排序HTML报告 -> {output_path}")
+        nexus_base = f"{self.settings.NEXUS_BASE_URL}/{self.settings.GAME_NAME}/mods/"
         missing_html = ""
         if missing_report:
             items = []
             for unmet_id, data in missing_report.items():
-                effective_id, effective_name = data['effective_id'], data.get('effective_name', data['name'])
-                req_url = f"{self.settings.NEXUS_BASE_URL}/{self.settings.GAME_NAME}/mods/{effective_id}"
+                effective_id, effective_name = data['effective_id'], data.get('effective_name', data['name']).translate(_ESCAPE_TABLE)
+                req_url = nexus_base + effective_id
                 title_html = f"<a href='{req_url}' target='_blank'>{effective_name}</a> (ID: {effective_id})"
                 if unmet_id != effective_id:
-                    original_url = f"{self.settings.NEXUS_BASE_URL}/{self.settings.GAME_NAME}/mods/{unmet_id}"
-                    title_html = f"{title_html} <span class='replacement-info'>(作为 <a href='{original_url}'>{data['name']}</a> 的替代)</span>"
+                    original_url = nexus_base + unmet_id
+                    title_html = f"{title_html} <span class='replacement-info'>(作为 <a href='{original_url}'>{data['name'].translate(_ESCAPE_TABLE)}</a> 的替代)</span>"
                 details_parts = []
                 if data['required_by_installed']:
                     installed_requirers = []
                     for folder_name, notes in data['required_by_installed']:
-                        note_html = f" <span class='notes'>({notes})</span>" if notes else ""
-                        installed_requirers.append(f"<strong>{folder_name}</strong>{note_html}")
+                        note_html = f" <span class='notes'>({notes.translate(_ESCAPE_TABLE)})</span>" if notes else ""
+                        installed_requirers.append(f"<strong>{folder_name.translate(_ESCAPE_TABLE)}</strong>{note_html}")
                     details_parts.append(
                         f"<em>被以下 <strong class='dep-satisfied'>已安装</strong> 模组需要:</em> {', '.join(installed_requirers)}")
                 if data['required_by_missing']:
                     missing_links = [
-                        f"<a href='{self.settings.NEXUS_BASE_URL}/{self.settings.GAME_NAME}/mods/{req_id}' target='_blank'>{name}</a>"
+                        f"<a href='{nexus_base}{req_id}' target='_blank'>{name.translate(_ESCAPE_TABLE)}</a>"
                         for name, req_id in data['required_by_missing']]
                     details_parts.append(
                         f"<em>被以下 <strong class='dep-missing'>未安装</strong> 模组需要:</em> {', '.join(missing_links)}")
@@ -699,52 +1342,67 @@ class ModAnalyzer:
 
         cyclic_html = ""
         if cyclic_nodes:
-            items = [f"<li>{mod} (ID: {self.folder_to_id.get(mod, 'N/A')})</li>" for mod in cyclic_nodes]
-            cyclic_html = f"<div class='error-box'><h2>检测到循环依赖！</h2><p>无法完成排序。请检查以下模组之间的依赖关系：</p><ul>{''.join(items)}</ul></div>"
-        body_content = ""
+            items = [f"<li>{mod.translate(_ESCAPE_TABLE)} (ID: {self.folder_to_id.get(mod, 'N/A')})</li>" for mod in cyclic_nodes]
+            path_html = f"<p>其中一条循环路径 (每个模组依赖于其后的模组)：<strong>{' → '.join(cycle_path).translate(_ESCAPE_TABLE)}</strong></p>" if cycle_path else ""
+            cyclic_html = f"<div class='error-box'><h2>检测到循环依赖！</h2><p>无法完成排序。请检查以下模组之间的依赖关系：</p>{path_html}<ul>{''.join(items)}</ul></div>"
+
+        # 报告内容逐片段写入内存缓冲区，不再为每行构建中间列表
+        buf = io.StringIO()
+        write = buf.write
+        write(f"<h1>MO2模组智能排序报告</h1>{missing_html}{cyclic_html}")
         if not cyclic_nodes:
-            rows, last_priority = [], -1
+            write(f"<h2>MO2左侧面板建议顺序</h2><p>共排序 {len(sorted_order)} 个模组。</p><table><thead><tr><th>#</th><th>模组文件夹</th><th>Nexus ID</th><th>直接前置依赖</th></tr></thead><tbody>")
+            last_priority = -1
             priority_to_category = {v: k for k, v in self.settings.CATEGORY_PRIORITIES.items()}
-            for i, folder_name in enumerate(sorted_order):
+            get_mod_data, effective_id_of, folders_of = self.get_mod_data, self.replacement_map.get, self.id_to_folders.get
+            ignore_ids, installed_ids = self.ignore_ids, self.installed_ids
+            # 同一个前置往往被许多模组依赖，其HTML片段按模组ID生成一次后复用
+            satisfied_snippets: Dict[str, str] = {}
+            missing_snippets: Dict[str, str] = {}
+            for i, folder_name in enumerate(sorted_order, 1):
                 mod_id = self.folder_to_id.get(folder_name)
-                mod_data = self.get_mod_data(mod_id)
-                priority = self.settings.CATEGORY_PRIORITIES.get(mod_data.get("category", "Default"), 50)
+                mod_data = get_mod_data(mod_id)
+                priority = self._get_category_priority(mod_id)
                 if priority != last_priority:
-                    cat_name = next((name for p, name in sorted(priority_to_category.items()) if p == priority),
-                                    "未知分类")
-                    rows.append(
+                    cat_name = priority_to_category.get(priority, "未知分类")
+                    write(
                         f"<tr class='category-header'><td colspan='4'>--- {priority:02d}. {cat_name} ---</td></tr>")
                     last_priority = priority
-                nexus_url = f"{self.settings.NEXUS_BASE_URL}/{self.settings.GAME_NAME}/mods/{mod_id}" if mod_id else "#"
-                dep_parts = []
-                if mod_id and mod_id in full_graph:
-                    for req_info in full_graph.get(mod_id, []):
-                        req_id, notes = req_info['id'], req_info['notes']
-                        note_html = f" <span class='notes'>({notes})</span>" if notes else ""
-                        if req_id in self.ignore_ids: continue
-                        effective_id = self._get_effective_id(req_id)
-                        if effective_id in self.installed_ids:
-                            provider_folders = ", ".join(self.id_to_folders.get(effective_id, ['?']))
-                            replace_note = f" (替代 <span class='dep-original'>{self.get_mod_data(req_id).get('name', f'ID {req_id}')}</span>)" if req_id != effective_id else ""
-                            dep_parts.append(
-                                f"<span class='dep-satisfied'>{provider_folders}{replace_note}{note_html}</span>")
+                nexus_url = nexus_base + mod_id if mod_id else "#"
+                write(f"<tr><td>{i}</td><td><strong>{folder_name.translate(_ESCAPE_TABLE)}</strong><br><span class='nexus-name'>{mod_data.get('name', 'N/A').translate(_ESCAPE_TABLE)}</span></td>"
+                      f"<td><a href='{nexus_url}' target='_blank'>{mod_id or 'N/A'}</a></td><td>")
+                has_deps = False
+                if mod_id and (req_ids := graph_ids.get(mod_id)):
+                    for req_id, notes in zip(req_ids, graph_notes[mod_id]):
+                        if req_id in ignore_ids: continue
+                        if has_deps: write(", ")
+                        has_deps = True
+                        effective_id = effective_id_of(req_id, req_id)
+                        if effective_id in installed_ids:
+                            if (snippet := satisfied_snippets.get(effective_id)) is None:
+                                snippet = satisfied_snippets[effective_id] = \
+                                    "<span class='dep-satisfied'>" + ", ".join(folders_of(effective_id, ['?'])).translate(_ESCAPE_TABLE)
+                            write(snippet)
+                            if req_id != effective_id:
+                                write(f" (替代 <span class='dep-original'>{get_mod_data(req_id).get('name', f'ID {req_id}').translate(_ESCAPE_TABLE)}</span>)")
                         else:
-                            req_name, eff_name = self.get_mod_data(req_id).get("name"), self.get_mod_data(
-                                effective_id).get("name")
-                            req_url = f"{self.settings.NEXUS_BASE_URL}/{self.settings.GAME_NAME}/mods/{effective_id}"
-                            replace_note = f" (替代 {req_name})" if req_id != effective_id else ""
-                            dep_parts.append(
-                                f"<span class='dep-missing'><a href='{req_url}' target='_blank'>{eff_name}</a>{replace_note}{note_html}</span>")
-                deps_html = ", ".join(dep_parts) or "<span class='no-deps'>无</span>"
-                rows.append(
-                    f"<tr><td>{i + 1}</td><td><strong>{folder_name}</strong><br><span class='nexus-name'>{mod_data.get('name', 'N/A')}</span></td><td><a href='{nexus_url}' target='_blank'>{mod_id or 'N/A'}</a></td><td>{deps_html}</td></tr>")
-            body_content = f"<h2>MO2左侧面板建议顺序</h2><p>共排序 {len(sorted_order)} 个模组。</p><table><thead><tr><th>#</th><th>模组文件夹</th><th>Nexus ID</th><th>直接前置依赖</th></tr></thead><tbody>{''.join(rows)}</tbody></table>"
-
-        html_style = textwrap.dedent("""
-            body{font-family:-apple-system, BlinkMacSystemFont, "Segoe UI", sans-serif;margin:20px;background-color:#f8f9fa; line-height: 1.6;} h1,h2{color:#343a40;border-bottom:2px solid #007bff;padding-bottom:10px} table{width:100%;border-collapse:collapse;margin-top:20px;box-shadow:0 2px 5px rgba(0,0,0,0.1)} th,td{padding:12px 15px;text-align:left;border-bottom:1px solid #dee2e6; vertical-align: top;} th{background-color:#007bff;color:white} tr:nth-child(even){background-color:#f2f2f2} tr:hover{background-color:#e9ecef} a{color:#0056b3;text-decoration:none} a:hover{text-decoration:underline} .nexus-name,.details{font-size:0.9em;color:#6c757d} .details{margin-top: 5px; padding-left: 10px; border-left: 2px solid #ddd;} .notes{font-style:italic;color:#5a6268;font-size:0.9em; margin-left: 4px;} .no-deps{color:#28a745;font-style:italic} .dep-satisfied, .dep-satisfied strong{color: #1e6b20;} .dep-original{color: #555; text-decoration: line-through;} .dep-missing, .dep-missing a, .dep-missing strong{color:#c0392b !important; font-weight: bold;} .replacement-info, .replacement-info a{font-style:italic;color:#3498db;font-size:0.9em; font-weight: bold;} .error-box,.warning-box{padding:1rem 1.5rem;margin: 20px 0;border-radius:5px} .error-box{background-color:#f8d7da;color:#721c24;border:1px solid #f5c6cb} .warning-box{background-color:#fff3cd;color:#856404;border:1px solid #ffeeba} .warning-box h2,.error-box h2{border:none;margin-top:0} .warning-box li{margin:10px 0} .category-header td{background-color:#e9ecef;font-weight:bold;color:#495057; text-align: center;}
-            """)
-        html = f"<!DOCTYPE html><html lang='zh-CN'><head><meta charset='UTF-8'><title>MO2模组智能排序报告</title><style>{html_style}</style></head><body><h1>MO2模组智能排序报告</h1>{missing_html}{cyclic_html}{body_content}</body></html>"
-        output_path.write_text(textwrap.dedent(html).strip(), encoding='utf-8')
+                            if (snippet := missing_snippets.get(effective_id)) is None:
+                                snippet = missing_snippets[effective_id] = \
+                                    f"<span class='dep-missing'><a href='{nexus_base}{effective_id}' target='_blank'>{get_mod_data(effective_id).get('name').translate(_ESCAPE_TABLE)}</a>"
+                            write(snippet)
+                            if req_id != effective_id:
+                                write(f" (替代 {get_mod_data(req_id).get('name').translate(_ESCAPE_TABLE)})")
+                        if notes:
+                            write(f" <span class='notes'>({notes.translate(_ESCAPE_TABLE)})</span>")
+                        write("</span>")
+                if not has_deps:
+                    write("<span class='no-deps'>无</span>")
+                write("</td></tr>")
+            write("</tbody></table>")
+        write("</body></html>")
+        with open(output_path, 'wb') as f:
+            f.write(_SORT_REPORT_HEAD)
+            f.write(buf.getvalue().encode('utf-8'))
 
 
 # =============================================================================
@@ -755,16 +1413,20 @@ class Worker(QObject):
     analysis_finished = pyqtSignal(str)
     error = pyqtSignal(str)
 
-    def __init__(self, organizer: mobase.IOrganizer, plugin_name: str):
+    def __init__(self, organizer: mobase.IOrganizer, plugin_name: str, settings: PluginSettings):
         super().__init__()
         self.organizer = organizer
         self.plugin_name = plugin_name
-        self.settings = PluginSettings(organizer, plugin_name)
+        self.settings = settings
         self.analyzer: ModAnalyzer = None # type: ignore
+        # 浏览器会话在本线程的多次分析之间保持运行，窗口关闭时由 shutdown() 释放
+        self.browser_session: Optional[BrowserSession] = None
 
     def _run_analysis(self, analysis_func):
         try:
-            self.analyzer = ModAnalyzer(self.organizer, self.settings, self.progress)
+            if self.browser_session is None:
+                self.browser_session = BrowserSession(self.settings.BROWSER_PROFILE_DIR)
+            self.analyzer = ModAnalyzer(self.organizer, self.settings, self.progress, self.browser_session)
             if not self.analyzer._initialize_browser():
                 self.error.emit(
                     f"浏览器初始化失败！请检查日志获取更多信息。"
@@ -789,17 +1451,37 @@ class Worker(QObject):
     def run_full_profile_analysis(self):
         self._run_analysis(lambda: self.analyzer.generate_sorted_load_order())
 
+    def shutdown(self):
+        """在工作线程中关闭浏览器会话，然后结束线程的事件循环。"""
+        try:
+            if self.browser_session:
+                self.browser_session.close()
+                self.browser_session = None
+        except Exception:
+            log.exception("关闭浏览器会话时出错。")
+        finally:
+            self.thread().quit()
+
     def clear_cache(self):
+        # 分析器在每次分析结束时关闭数据库连接，此时直接删除数据库文件 (含 WAL 日志) 与旧版JSON缓存即可
+        cache_path = self.settings.CACHE_DB_PATH
+        paths = (cache_path, cache_path.with_name(cache_path.name + '-wal'), cache_path.with_name(cache_path.name + '-shm'),
+                 self.settings.CACHE_FILE_PATH)
+        removed = False
         try:
-            settings = PluginSettings(self.organizer, self.plugin_name)
-            cache_file = settings.CACHE_FILE_PATH
-            if cache_file.exists():
-                os.remove(cache_file)
-                self.progress.emit(f"[SUCCESS] 缓存文件 '{cache_file.name}' 已成功清理。")
-            else:
-                self.progress.emit("[INFO] 缓存文件不存在，无需清理。")
+            for path in paths:
+                try:
+                    path.unlink()
+                    removed = True
+                except FileNotFoundError:
+                    pass
         except Exception as e:
             self.error.emit(f"清理缓存时出错: {e}")
+            return
+        if removed:
+            self.progress.emit(f"[SUCCESS] 缓存 '{cache_path.name}' 已成功清理。")
+        else:
+            self.progress.emit("[INFO] 缓存文件不存在，无需清理。")
 
 
 # =============================================================================
@@ -809,6 +1491,12 @@ class AnalyzerDialog(QDialog):
     start_single_analysis_signal = pyqtSignal(str)
     start_full_analysis_signal = pyqtSignal()
     start_clear_cache_signal = pyqtSignal()
+    shutdown_worker_signal = pyqtSignal()
+
+    # 最近一次格式化的日志时间戳: (Unix秒, "时:分:秒")，同一秒内的日志复用同一个字符串
+    _log_timestamp: Tuple[int, str] = (0, "")
+    # 非 Windows 平台上用于打开报告的浏览器控制器，首次打开时解析一次后复用
+    _browser: Optional[webbrowser.BaseBrowser] = None
 
     def __init__(self, organizer: mobase.IOrganizer, plugin_name: str, parent=None):
         super().__init__(parent)
@@ -846,7 +1534,15 @@ class AnalyzerDialog(QDialog):
         self.log_output = QPlainTextEdit()
         self.log_output.setReadOnly(True)
         self.log_output.setLineWrapMode(QPlainTextEdit.LineWrapMode.NoWrap)
+        # 只保留最近的若干行日志，超出后最早的行会被丢弃 (0 表示不限制)
+        self.log_output.setMaximumBlockCount(self.settings.LOG_MAX_LINES)
         log_layout.addWidget(self.log_output)
+        # 日志先暂存，短时间内到达的多条消息合并为一次追加，避免频繁的文档重排
+        self._log_buffer: List[str] = []
+        self._log_timer = QTimer(self)
+        self._log_timer.setSingleShot(True)
+        self._log_timer.setInterval(50)
+        self._log_timer.timeout.connect(self._flush_log)
         log_group.setLayout(log_layout)
         layout.addWidget(log_group, 1)
         bottom_layout = QHBoxLayout()
@@ -866,7 +1562,7 @@ class AnalyzerDialog(QDialog):
 
     def _setup_worker(self):
         self.thread = QThread()
-        self.worker = Worker(self.organizer, self.plugin_name)
+        self.worker = Worker(self.organizer, self.plugin_name, self.settings)
         self.worker.moveToThread(self.thread)
         self.worker.progress.connect(self.log_message)
         self.worker.analysis_finished.connect(self.on_analysis_finished)
@@ -874,6 +1570,7 @@ class AnalyzerDialog(QDialog):
         self.start_single_analysis_signal.connect(self.worker.run_single_mod_analysis)
         self.start_full_analysis_signal.connect(self.worker.run_full_profile_analysis)
         self.start_clear_cache_signal.connect(self.worker.clear_cache)
+        self.shutdown_worker_signal.connect(self.worker.shutdown)
         self.thread.start()
 
     def _set_ui_enabled(self, enabled: bool):
@@ -883,8 +1580,29 @@ class AnalyzerDialog(QDialog):
         self.mod_id_input.setEnabled(enabled)
 
     def log_message(self, message: str):
-        self.log_output.appendPlainText(f"[{datetime.now().strftime('%H:%M:%S')}] {message}")
-        self.log_output.moveCursor(QTextCursor.MoveOperation.End)
+        now = int(time.time())
+        if now != self._log_timestamp[0]:
+            self._log_timestamp = (now, time.strftime('%H:%M:%S', time.localtime(now)))
+        # 工作线程会把多行日志合并为一条消息发送，每一行都需要加上时间戳
+        prefix = f"[{self._log_timestamp[1]}] "
+        self._log_buffer.extend(prefix + line if line else line for line in message.split('\n'))
+        if not self._log_timer.isActive():
+            self._log_timer.start()
+
+    def _flush_log(self):
+        self._log_timer.stop()
+        if self._log_buffer:
+            # 仅在用户未向上翻看日志时才滚动到底部，且直接设置滚动条，不移动文本光标
+            scroll_bar = self.log_output.verticalScrollBar()
+            at_bottom = scroll_bar.value() == scroll_bar.maximum()
+            self.log_output.appendPlainText("\n".join(self._log_buffer))
+            self._log_buffer.clear()
+            if at_bottom:
+                scroll_bar.setValue(scroll_bar.maximum())
+
+    def _clear_log(self):
+        self._log_buffer.clear()
+        self.log_output.clear()
 
     def trigger_single_mod_analysis(self):
         mod_id = self.mod_id_input.text().strip()
@@ -892,13 +1610,13 @@ class AnalyzerDialog(QDialog):
             QMessageBox.warning(self, "输入无效", "请输入一个纯数字的 Nexus Mod ID。")
             return
         self._set_ui_enabled(False)
-        self.log_output.clear()
+        self._clear_log()
         self.log_message(f"--- 开始分析单个模组 (ID: {mod_id}) ---")
         self.start_single_analysis_signal.emit(mod_id)
 
     def trigger_full_profile_analysis(self):
         self._set_ui_enabled(False)
-        self.log_output.clear()
+        self._clear_log()
         self.log_message("--- 开始完整配置文件分析与排序 ---")
         self.start_full_analysis_signal.emit()
 
@@ -914,27 +1632,40 @@ class AnalyzerDialog(QDialog):
     def on_analysis_finished(self, report_path: str):
         self._set_ui_enabled(True)
         self.log_message(f"[SUCCESS] 分析完成！报告已保存至: {report_path}")
+        self._flush_log()
         if self.settings.AUTO_OPEN_REPORT:
-            webbrowser.open(f'file:///{report_path}')
+            self._open_report(report_path)
         else:
             reply = QMessageBox.information(self, "分析完成",
                                             f"报告已成功生成。\n\n路径: {report_path}\n\n是否立即在浏览器中打开？",
                                             QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No,
                                             QMessageBox.StandardButton.Yes)
             if reply == QMessageBox.StandardButton.Yes:
-                webbrowser.open(f'file:///{report_path}')
+                self._open_report(report_path)
+
+    def _open_report(self, report_path: str):
+        # Windows 上直接交给系统外壳以默认程序打开，无需经过 webbrowser 的浏览器查找
+        try:
+            if sys.platform == 'win32':
+                os.startfile(report_path)
+                return
+            if self._browser is None:
+                self._browser = webbrowser.get()
+            self._browser.open(f'file:///{report_path}')
+        except (OSError, webbrowser.Error) as e:
+            self.log_message(f"[WARNING] 无法自动打开报告 ({e})，请手动打开: {report_path}")
 
     def on_error(self, message: str):
         self._set_ui_enabled(True)
         self.log_message(f"[ERROR] {message}")
+        self._flush_log()
         QMessageBox.critical(self, "发生错误", message)
 
     def open_rules_file(self):
         rules_path = self.settings.RULES_PATH
         if not rules_path.exists():
             try:
-                temp_analyzer = ModAnalyzer(self.organizer, self.settings, self.log_message)
-                temp_analyzer._create_default_rules_file()
+                _write_default_rules_file(self.settings)
                 self.log_message(f"规则文件已创建于: {rules_path}")
             except Exception as e:
                 self.on_error(f"创建规则文件失败: {e}")
@@ -942,11 +1673,20 @@ class AnalyzerDialog(QDialog):
         self.log_message(f"正在打开规则文件: {rules_path}")
         os.startfile(rules_path)
 
-    def closeEvent(self, event):
-        self.log_message("正在关闭窗口和后台线程...")
+    def _shutdown_worker(self):
         if self.thread and self.thread.isRunning():
-            self.thread.quit()
-            self.thread.wait(3000)
+            self.log_message("正在关闭窗口和后台线程...")
+            # 浏览器会话属于工作线程，需在该线程中关闭，随后由 Worker.shutdown 结束线程
+            self.shutdown_worker_signal.emit()
+            self.thread.wait(5000)
+
+    def done(self, result: int):
+        # 按 Esc 关闭 (reject) 时不会触发 closeEvent，因此在 done 中同样关闭后台线程与浏览器
+        self._shutdown_worker()
+        super().done(result)
+
+    def closeEvent(self, event):
+        self._shutdown_worker()
         super().closeEvent(event)
 
 
@@ -1021,6 +1761,16 @@ class ModDepAnalyzerPlugin(mobase.IPluginTool):
                 "auto_open_report",
                 "分析完成后是否自动在浏览器中打开HTML报告文件。",
                 True
+            ),
+            mobase.PluginSetting(
+                "max_concurrent_requests",
+                "同时抓取的Nexus页面数量上限。数值越大分析越快，但过高可能触发Nexus的访问频率限制。",
+                8
+            ),
+            mobase.PluginSetting(
+                "log_max_lines",
+                "日志窗口最多保留的行数，超出后最早的日志会被丢弃。设为0表示不限制。",
+                5000
             )
         ]
 